@@ -1,4 +1,4 @@
-from formula1.ergast import QuerySeason
+from formula1.ergast import QueryBase, QuerySeason
 
 
 class ErgastDataset(object):
@@ -6,5 +6,6 @@ class ErgastDataset(object):
         pass
 
     def build_dataset(self, season=None):
-        query_season = QuerySeason()
-        return query_season.call()
+        queries = [QuerySeason()]
+        (seasons,) = QueryBase.bulk_call(queries)
+        return seasons
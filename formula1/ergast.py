@@ -1,8 +1,3 @@
-import requests
-import numpy as np
-
-from pandas import DataFrame
-
 """
 This package provides interfaces to the Ergast API.
 
@@ -17,6 +12,25 @@ All API queries require a GET request using a URL of the form:
 http[s]://ergast.com/api/<series>/<season>/<round>/...
 """
 
+import os
+import types
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import orjson
+
+from pandas import DataFrame, concat, json_normalize
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+# Environment variable overriding where responses are cached
+CACHE_ENV = "FORMULA1_DS_CACHE"
+
+# Subclasses built by QueryBase._with_flags, keyed by base class and flags
+_FLAGGED_QUERIES = {}
+
 
 class ErgastFilters(object):
     """List of common enums for Ergast filters"""
@@ -30,20 +44,119 @@ class ErgastFilters(object):
     STATUS = "status"
 
 
+class ErgastSeasons(object):
+    """List of common enums for Ergast seasons"""
+
+    CURRENT = "current"
+
+
+def split_by(data, column) -> list:
+    """Partition a DataFrame into one frame per value of a column
+
+    Arguments:
+        data {DataFrame} -- data to partition
+        column {str} -- column to partition on, dropped from the results
+
+    Returns:
+        list -- DataFrames in order of first appearance
+    """
+    if data.empty:
+        return []
+    return [
+        group.drop(columns=[column]).reset_index(drop=True)
+        for _, group in data.groupby(column, sort=False)
+    ]
+
+
+def drop_urls(row) -> dict:
+    """Copy of a json object without its url, including the urls of nested
+    objects such as Driver or Circuit that would otherwise be flattened
+    into columns.
+
+    Arguments:
+        row {dict} -- json object
+
+    Returns:
+        dict -- json object without urls
+    """
+    return {
+        key: drop_urls(value) if isinstance(value, dict) else value
+        for key, value in row.items()
+        if key != "url"
+    }
+
+
+def get_cache_path() -> str:
+    """Location of the response cache, read from FORMULA1_DS_CACHE when it is
+    set and otherwise kept per user under XDG_CACHE_HOME or ~/.cache, never
+    in the working directory.
+
+    Returns:
+        str -- path of the cache without the backend's extension
+    """
+    cache_path = os.environ.get(CACHE_ENV)
+    if cache_path:
+        return cache_path
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "formula1-ds", "ergast")
+
+
+def build_session(cache_path=None) -> CachedSession:
+    """Build a session shared by every query so connections to Ergast are
+    kept alive and reused instead of renegotiated on each call. Responses
+    are cached on disk so historical data is only downloaded once, and
+    rate limits or transient server errors are retried with backoff.
+
+    Keyword Arguments:
+        cache_path {str} -- Location of the response cache
+            (default: {get_cache_path()})
+
+    Returns:
+        CachedSession -- session with a pooled https adapter
+    """
+    cache_path = os.path.abspath(cache_path or get_cache_path())
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    session = CachedSession(
+        cache_path,
+        backend="sqlite",
+        expire_after=timedelta(days=15),
+        cache_control=True,
+    )
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    session.mount(
+        "https://",
+        HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=20),
+    )
+    # Advertises brotli alongside gzip only when urllib3 is able to decode it
+    session.headers.update(make_headers(accept_encoding=True))
+    session.headers["User-Agent"] = "formula1-ds"
+    return session
+
+
 class QueryBase(object):
     """Base object for querying against Ergast APIs"""
 
+    __slots__ = ("season", "race", "lap", "filters", "_url", "_json_url")
+
     BASE_URL = "https://ergast.com/api/f1"
-    URL_FORMAT = "{base}{filter}{data}"
-    SUPPORTED_FILTERS = [
-        ErgastFilters.CIRCUITS,
-        ErgastFilters.CONSTRUCTORS,
-        ErgastFilters.DRIVERS,
-        ErgastFilters.GRID,
-        ErgastFilters.RESULTS,
-        ErgastFilters.FASTEST,
-        ErgastFilters.STATUS,
-    ]
+    SUPPORTED_FILTERS = frozenset(
+        {
+            ErgastFilters.CIRCUITS,
+            ErgastFilters.CONSTRUCTORS,
+            ErgastFilters.DRIVERS,
+            ErgastFilters.GRID,
+            ErgastFilters.RESULTS,
+            ErgastFilters.FASTEST,
+            ErgastFilters.STATUS,
+        }
+    )
 
     supports_season = False
     requires_season = False
@@ -52,82 +165,166 @@ class QueryBase(object):
     supports_lap = False
     requires_lap = False
 
+    CURRENT_SEASON_TTL = 60
+    HISTORICAL_SEASON_TTL = 86400 * 30
+    TIMEOUT = 10
+    LIMIT = 1000
+    DTYPES = {}
+
+    _session = None
+
     def __init__(self, season=None, race=None, lap=None, filters=None):
         """Initialize a new object
 
         Keyword Arguments:
             season {int or str} -- Season as integer or string (default: {None})
             race {int} -- Race number within the season (default: {None})
-            filters {dict} -- Dictionary of desired filters (default: {None})
+            filters {dict or tuple} -- Desired filters as a dictionary or
+                tuple of (filter, value) pairs (default: {None})
         """
         self.season = season
         self.race = race
         self.lap = lap
-        self.supported_filters = self.SUPPORTED_FILTERS
-        self.filters = filters
+        if isinstance(filters, dict):
+            filters = tuple(filters.items())
+        self.filters = filters or ()
 
-        self.check_season()
-        self.check_race()
-        self.check_lap()
-        self.check_filters()
+        for validate in self.VALIDATORS:
+            validate(self)
+
+        self._url = None
+        self._json_url = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.VALIDATORS = cls.build_validators()
+
+    @classmethod
+    def build_validators(cls) -> tuple:
+        """Select the checks a query needs once when the class is created,
+        so construction does not re-test the class level support flags.
+
+        Returns:
+            tuple -- check methods to run against each new object
+        """
+        validators = []
+        for field in ("season", "race", "lap"):
+            if getattr(cls, f"supports_{field}"):
+                if getattr(cls, f"requires_{field}"):
+                    validators.append(getattr(cls, f"check_{field}_required"))
+                validators.append(getattr(cls, f"check_{field}"))
+            else:
+                validators.append(getattr(cls, f"check_{field}_not_supported"))
+        validators.append(cls.check_filters)
+        return tuple(validators)
+
+    @classmethod
+    def _with_flags(cls, **flags) -> type:
+        """Subclass of this query with its support and require flags
+        overridden, built once per combination of flags.
+
+        Keyword Arguments:
+            supports_{field} / requires_{field} {bool} -- flag values for the
+                season, race and lap fields
+
+        Returns:
+            type -- query class with the given flags
+        """
+        allowed = {
+            f"{kind}_{field}"
+            for kind in ("supports", "requires")
+            for field in ("season", "race", "lap")
+        }
+        unknown = sorted(set(flags) - allowed)
+        if unknown:
+            raise ValueError(f"Unknown query flags: {', '.join(unknown)}")
+
+        key = (cls, tuple(sorted(flags.items())))
+        if key not in _FLAGGED_QUERIES:
+            flag_names = ", ".join(f"{name}={value}" for name, value in key[1])
+            _FLAGGED_QUERIES[key] = types.new_class(
+                f"{cls.__name__}({flag_names})",
+                (cls,),
+                exec_body=lambda namespace: namespace.update(flags, __slots__=()),
+            )
+        return _FLAGGED_QUERIES[key]
 
     def check_filters(self) -> None:
         """Check filters are valid"""
-        if self.filters is not None:
-            for filt in self.filters.keys():
-                if filt not in self.supported_filters:
-                    self.raise_filter_not_supported(filt)
+        for filt, _ in self.filters:
+            if filt not in self.SUPPORTED_FILTERS:
+                self.raise_filter_not_supported(filt)
+
+    def check_season_required(self) -> None:
+        """Check a season was provided"""
+        if self.season is None:
+            raise ValueError("Season is required for this query")
+
+    def check_season_not_supported(self) -> None:
+        """Check no season was provided"""
+        if self.season is not None:
+            raise ValueError("Season is not supported for this query")
 
     def check_season(self) -> None:
         """Check the season value is valid"""
-        if self.supports_season:
-            if self.requires_season and self.season is None:
-                raise ValueError("Season is required for this query")
-
-            if isinstance(self.season, str):
-                if self.season != "current":
-                    raise ValueError(
-                        "Season supports the string value 'current' or an integer between 1950 and 2021"
-                    )
-            elif self.season is not None:
-                self.season = np.int(self.season)
-                if self.season < 1950 or self.season > 2021:
-                    raise ValueError(
-                        "Season supports the string value 'current' or integers between 1950 and 2021"
-                    )
-        else:
-            if self.season is not None:
-                raise ValueError("Season is not supported for this query")
+        if isinstance(self.season, str):
+            if self.season != ErgastSeasons.CURRENT:
+                raise ValueError(
+                    "Season supports the string value 'current' or an integer between 1950 and 2021"
+                )
+        elif self.season is not None:
+            try:
+                self.season = int(self.season)
+            except (TypeError, ValueError):
+                raise ValueError(
+                    "Season must be an integer or the string value 'current'"
+                ) from None
+            if self.season < 1950 or self.season > 2021:
+                raise ValueError(
+                    "Season supports the string value 'current' or integers between 1950 and 2021"
+                )
+
+    def check_race_required(self) -> None:
+        """Check a race was provided"""
+        if self.race is None:
+            raise ValueError("Race is required for this query")
+
+    def check_race_not_supported(self) -> None:
+        """Check no race was provided"""
+        if self.race is not None:
+            raise ValueError("Race is not supported for this query")
 
     def check_race(self) -> None:
-        """Check the season value is valid"""
-        if self.supports_race:
-            if self.requires_race and self.race is None:
-                raise ValueError("Race is required for this query")
-
-            if self.race is not None:
-                self.race = np.int(self.race)
-                if self.race < 1 or self.race > 23:
-                    raise ValueError("Race supports integers between 1 and 23")
-        else:
-            if self.race is not None:
-                raise ValueError("Race is not supported for this query")
+        """Check the race value is valid"""
+        if self.race is not None:
+            try:
+                self.race = int(self.race)
+            except (TypeError, ValueError):
+                raise ValueError("Race must be an integer") from None
+            if self.race < 1 or self.race > 23:
+                raise ValueError("Race supports integers between 1 and 23")
+
+    def check_lap_required(self) -> None:
+        """Check a lap was provided"""
+        if self.lap is None:
+            raise ValueError("Lap is required for this query")
+
+    def check_lap_not_supported(self) -> None:
+        """Check no lap was provided"""
+        if self.lap is not None:
+            raise ValueError("Lap is not supported for this query")
 
     def check_lap(self) -> None:
-        """Check the season value is valid"""
-        if self.supports_lap:
-            if self.requires_lap and self.lap is None:
-                raise ValueError("Lap is required for this query")
-
-            if self.lap is not None:
-                self.lap = np.int(self.lap)
-                if self.lap < 1:
-                    raise ValueError("Lap supports integers values greater than 1")
-                if self.lap > 100:
-                    raise ValueError("No races have more than 100 laps")
-        else:
-            if self.lap is not None:
-                raise ValueError("Lap is not supported for this query")
+        """Check the lap value is valid"""
+        if self.lap is not None:
+            try:
+                self.lap = int(self.lap)
+            except (TypeError, ValueError):
+                raise ValueError("Lap must be an integer") from None
+            if self.lap < 1:
+                raise ValueError("Lap supports integers values greater than 1")
+            if self.lap > 100:
+                raise ValueError("No races have more than 100 laps")
 
     def get_data(self) -> str:
         """Get data should be implemented in the child functions
@@ -137,30 +334,108 @@ class QueryBase(object):
         """
         raise NotImplementedError
 
-    def format_data(self, json_data) -> DataFrame:
+    def format_data(self, json_data, keep_url=False) -> DataFrame:
         return json_data
 
+    def build_frame(self, rows, keep_url=False) -> DataFrame:
+        """Flatten json rows into a DataFrame, nested objects become columns
+        joined with an underscore and known columns are cast to DTYPES.
+
+        Arguments:
+            rows {list} -- list of json objects
+
+        Keyword Arguments:
+            keep_url {bool} -- Keep the url of each row (default: {False})
+
+        Returns:
+            DataFrame -- flattened and typed data
+        """
+        if not keep_url:
+            rows = [drop_urls(row) for row in rows]
+        return self.apply_dtypes(json_normalize(rows, sep="_"))
+
+    def apply_dtypes(self, data) -> DataFrame:
+        """Cast the columns listed in DTYPES that are present in the data
+
+        Arguments:
+            data {DataFrame} -- flattened data
+
+        Returns:
+            DataFrame -- typed data
+        """
+        return data.astype(
+            {column: dtype for column, dtype in self.DTYPES.items() if column in data}
+        )
+
     def get_filter(self) -> str:
         """Concatenate filters together
 
         Returns:
             str -- string to add to the url
         """
-        filters = ""
-        if self.filters is not None:
-            for filter, value in self.filters.items():
-                filters += "/{}/{}".format(filter, value)
-        return filters
+        return "".join(f"/{filter}/{value}" for filter, value in self.filters)
 
     def get_url(self) -> str:
-        """Combine pieces of request into a final url
+        """Combine pieces of request into a final url. The url is built once
+        and reused since the query is fully validated at construction.
+
+        Returns:
+            str -- url for request
+        """
+        if self._url is None:
+            self._url = f"{self.BASE_URL}{self.get_filter()}{self.get_data()}"
+        return self._url
+
+    def get_json_url(self) -> str:
+        """Url for requesting the json representation of the query, built
+        once and reused across calls and pages.
 
         Returns:
             str -- url for request
         """
-        data = self.get_data()
-        filter = self.get_filter()
-        return self.URL_FORMAT.format(base=self.BASE_URL, data=data, filter=filter)
+        if self._json_url is None:
+            self._json_url = f"{self.get_url()}.json"
+        return self._json_url
+
+    def get_params(self, offset=0) -> dict:
+        """Query string parameters sent alongside the url
+
+        Keyword Arguments:
+            offset {int} -- Offset of the first row of the page (default: {0})
+
+        Returns:
+            dict -- parameters for the request
+        """
+        if offset:
+            return {"limit": self.LIMIT, "offset": offset}
+        return {"limit": self.LIMIT}
+
+    def get_page_offsets(self, json_data) -> range:
+        """Offsets of the pages remaining after the first response. The step
+        is the page size the server reports, which may be smaller than the
+        requested limit when Ergast caps it.
+
+        Arguments:
+            json_data {dict} -- json response for the first page
+
+        Returns:
+            range -- offsets of the pages still to fetch
+        """
+        mr_data = json_data["MRData"]
+        limit = int(mr_data.get("limit", self.LIMIT))
+        offset = int(mr_data.get("offset", 0))
+        return range(offset + limit, int(mr_data["total"]), limit)
+
+    def get_cache_ttl(self) -> int:
+        """Past seasons never change so they can be cached for a long time,
+        anything touching the current season is refreshed quickly.
+
+        Returns:
+            int -- seconds to keep the response cached
+        """
+        if self.season in (None, ErgastSeasons.CURRENT):
+            return self.CURRENT_SEASON_TTL
+        return self.HISTORICAL_SEASON_TTL
 
     def call(self, keep_url=False) -> str:
         """Submit a call to the Ergast API
@@ -168,37 +443,111 @@ class QueryBase(object):
         Returns:
             str -- json response from the api
         """
-        r = requests.get("{}.json".format(self.get_url()))
+        pages = [self.fetch()]
+        pages += [self.fetch(offset) for offset in self.get_page_offsets(pages[0])]
+        return self.process_data(pages, keep_url=keep_url)
 
-        assert r.status_code == 200
-        json_data = r.json()
-        formatted_data = self.format_data(json_data)
+    def fetch(self, offset=0) -> dict:
+        """Fetch a single page of the query from the Ergast API
 
-        if not keep_url:
-            if (
-                isinstance(formatted_data, DataFrame)
-                and "url" in formatted_data.columns
-            ):
-                formatted_data = formatted_data.drop(columns=["url"])
+        Keyword Arguments:
+            offset {int} -- Offset of the first row of the page (default: {0})
+
+        Returns:
+            dict -- json response from the api
+        """
+        r = self.get_session().get(
+            self.get_json_url(),
+            params=self.get_params(offset),
+            timeout=self.TIMEOUT,
+            expire_after=self.get_cache_ttl(),
+        )
 
-        return formatted_data
+        r.raise_for_status()
+        return orjson.loads(r.content)
 
-    def raise_season_required(self) -> None:
-        raise ValueError("Season is required for this query")
+    def process_data(self, pages, keep_url=False) -> DataFrame:
+        """Format json responses and combine the pages into a single result
 
-    def raise_season_not_supported(self) -> None:
-        raise ValueError("Season is not supported for this query")
+        Arguments:
+            pages {list} -- json response for each page from the api
 
-    def raise_race_not_supported(self) -> None:
-        raise ValueError("Race is not supported for this query")
+        Keyword Arguments:
+            keep_url {bool} -- Keep the url column in the result (default: {False})
+
+        Returns:
+            DataFrame -- formatted response
+        """
+        formatted_data = [self.format_data(json_data, keep_url) for json_data in pages]
+        if len(formatted_data) == 1:
+            return formatted_data[0]
+        # Categories differ between pages and fall back to object when combined
+        return self.apply_dtypes(concat(formatted_data, ignore_index=True))
+
+    @classmethod
+    def bulk_call(cls, queries, concurrency=16, keep_url=False) -> list:
+        """Submit many calls to the Ergast API concurrently. Each query is
+        called from a bounded thread pool on the shared session, so the batch
+        is cached, retried and sent with the same headers as a single call.
+
+        Arguments:
+            queries {list} -- query objects to execute
+
+        Keyword Arguments:
+            concurrency {int} -- Maximum requests in flight (default: {16})
+            keep_url {bool} -- Keep the url column in the results (default: {False})
+
+        Returns:
+            list -- formatted responses in the same order as the queries
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+
+        # Built up front so the worker threads do not race to create it
+        cls.get_session()
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(queries))) as pool:
+            return list(pool.map(lambda query: query.call(keep_url=keep_url), queries))
+
+    @classmethod
+    def get_session(cls) -> CachedSession:
+        """Shared session for every query, built on first use so importing
+        the module does not open the response cache.
+
+        Returns:
+            CachedSession -- session shared by all queries
+        """
+        if QueryBase._session is None:
+            QueryBase._session = build_session()
+        return QueryBase._session
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Remove every cached response from the shared session"""
+        cls.get_session().cache.clear()
+
+    @classmethod
+    def close(cls) -> None:
+        """Close the shared session and its pooled connections"""
+        if QueryBase._session is not None:
+            QueryBase._session.close()
+            QueryBase._session = None
 
     def raise_filter_not_supported(self, filter) -> None:
         raise ValueError("Filter '{}' is not supported for this query".format(filter))
 
 
+QueryBase.VALIDATORS = QueryBase.build_validators()
+
+
 class QuerySeason(QueryBase):
     """Query object for querying Season level data"""
 
+    __slots__ = ()
+
+    URL = f"{QueryBase.BASE_URL}/seasons"
+    DTYPES = {"season": "int16"}
+
     def __init__(self, **kwargs) -> None:
         super(QuerySeason, self).__init__(**kwargs)
 
@@ -211,17 +560,31 @@ class QuerySeason(QueryBase):
         """
         return "/seasons"
 
-    def format_data(self, json_data) -> DataFrame:
-        return DataFrame(json_data["MRData"]["SeasonTable"]["Seasons"])
+    def get_url(self) -> str:
+        """Seasons without filters always resolve to the same url
+
+        Returns:
+            str -- url for request
+        """
+        if not self.filters:
+            return self.URL
+        return super(QuerySeason, self).get_url()
+
+    def format_data(self, json_data, keep_url=False) -> DataFrame:
+        return self.build_frame(json_data["MRData"]["SeasonTable"]["Seasons"], keep_url)
 
 
 class QueryRaceSchedule(QueryBase):
     """Query object for querying Season level data"""
 
+    __slots__ = ()
+
     supports_season = True
     requires_season = True
     supports_race = True
 
+    DTYPES = {"season": "int16", "round": "int8", "Circuit_circuitId": "category"}
+
     def __init__(self, **kwargs) -> None:
         super(QueryRaceSchedule, self).__init__(**kwargs)
 
@@ -237,26 +600,39 @@ class QueryRaceSchedule(QueryBase):
         else:
             return "/{}".format(self.season)
 
-    def format_data(self, json_data) -> DataFrame:
-        return DataFrame(json_data["MRData"]["RaceTable"]["Races"])
+    def format_data(self, json_data, keep_url=False) -> DataFrame:
+        return self.build_frame(json_data["MRData"]["RaceTable"]["Races"], keep_url)
 
 
 class QueryRaceResults(QueryBase):
     """Query object for querying Season level data"""
 
+    __slots__ = ()
+
     supports_season = True
     requires_season = True
     supports_race = True
     requires_race = True
 
-    SUPPORTED_FILTERS = [
-        ErgastFilters.CIRCUITS,
-        ErgastFilters.CONSTRUCTORS,
-        ErgastFilters.DRIVERS,
-        ErgastFilters.GRID,
-        ErgastFilters.FASTEST,
-        ErgastFilters.STATUS,
-    ]
+    SUPPORTED_FILTERS = frozenset(
+        {
+            ErgastFilters.CIRCUITS,
+            ErgastFilters.CONSTRUCTORS,
+            ErgastFilters.DRIVERS,
+            ErgastFilters.GRID,
+            ErgastFilters.FASTEST,
+            ErgastFilters.STATUS,
+        }
+    )
+    DTYPES = {
+        "position": "int16",
+        "points": "float32",
+        "grid": "int8",
+        "laps": "int16",
+        "status": "category",
+        "Driver_driverId": "category",
+        "Constructor_constructorId": "category",
+    }
 
     def __init__(self, **kwargs) -> None:
         super(QueryRaceResults, self).__init__(**kwargs)
@@ -273,18 +649,77 @@ class QueryRaceResults(QueryBase):
         else:
             return "/{}/results".format(self.season)
 
-    def format_data(self, json_data) -> DataFrame:
-        return DataFrame(json_data["MRData"]["RaceTable"]["Races"][0]["Results"])
+    def format_data(self, json_data, keep_url=False) -> DataFrame:
+        return self.build_frame(
+            json_data["MRData"]["RaceTable"]["Races"][0]["Results"], keep_url
+        )
+
+    @classmethod
+    def bulk_for_season(cls, season, **kwargs) -> list:
+        """Fetch the results of every race in a season with a single request
+
+        Arguments:
+            season {int or str} -- Season as integer or string
+
+        Keyword Arguments:
+            filters {dict or tuple} -- Desired filters (default: {None})
+
+        Returns:
+            list -- DataFrame of results for each race, in round order
+        """
+        data = QuerySeasonResults(season=season, **kwargs).call()
+        return split_by(data, "round")
+
+
+class QuerySeasonResults(QueryBase):
+    """Query object for querying the results of every race in a season"""
+
+    __slots__ = ()
+
+    supports_season = True
+    requires_season = True
+
+    SUPPORTED_FILTERS = QueryRaceResults.SUPPORTED_FILTERS
+    DTYPES = dict(QueryRaceResults.DTYPES, round="int8")
+
+    def __init__(self, **kwargs) -> None:
+        super(QuerySeasonResults, self).__init__(**kwargs)
+
+    def get_data(self) -> str:
+        """Return data for the results of a full season.
+
+        Returns:
+            str -- string to add to url
+        """
+        return "/{}/results".format(self.season)
+
+    def format_data(self, json_data, keep_url=False) -> DataFrame:
+        return self.build_frame(
+            [
+                dict(result, round=race["round"])
+                for race in json_data["MRData"]["RaceTable"]["Races"]
+                for result in race["Results"]
+            ],
+            keep_url,
+        )
 
 
 class QueryQualifyingResults(QueryBase):
     """Query object for querying Season level data"""
 
+    __slots__ = ()
+
     supports_season = True
     requires_season = True
     supports_race = True
     requires_race = True
 
+    DTYPES = {
+        "position": "int8",
+        "Driver_driverId": "category",
+        "Constructor_constructorId": "category",
+    }
+
     def __init__(self, **kwargs) -> None:
         super(QueryQualifyingResults, self).__init__(**kwargs)
 
@@ -300,15 +735,17 @@ class QueryQualifyingResults(QueryBase):
         else:
             return "/{}/qualifying".format(self.season)
 
-    def format_data(self, json_data) -> DataFrame:
-        return DataFrame(
-            json_data["MRData"]["RaceTable"]["Races"][0]["QualifyingResults"]
+    def format_data(self, json_data, keep_url=False) -> DataFrame:
+        return self.build_frame(
+            json_data["MRData"]["RaceTable"]["Races"][0]["QualifyingResults"], keep_url
         )
 
 
 class QueryLapTimes(QueryBase):
     """Query object for querying Season level data"""
 
+    __slots__ = ()
+
     supports_season = True
     requires_season = True
     supports_race = True
@@ -316,7 +753,8 @@ class QueryLapTimes(QueryBase):
     supports_lap = True
     requires_lap = True
 
-    SUPPORTED_FILTERS = []
+    SUPPORTED_FILTERS = frozenset()
+    DTYPES = {"position": "int8", "driverId": "category"}
 
     def __init__(self, **kwargs) -> None:
         super(QueryLapTimes, self).__init__(**kwargs)
@@ -330,7 +768,60 @@ class QueryLapTimes(QueryBase):
         """
         return "/{}/{}/laps/{}".format(self.season, self.race, self.lap)
 
-    def format_data(self, json_data) -> DataFrame:
-        return DataFrame(
-            json_data["MRData"]["RaceTable"]["Races"][0]["Laps"]["Timings"]
+    def format_data(self, json_data, keep_url=False) -> DataFrame:
+        return self.build_frame(
+            json_data["MRData"]["RaceTable"]["Races"][0]["Laps"]["Timings"], keep_url
+        )
+
+    @classmethod
+    def bulk_for_race(cls, season, race, **kwargs) -> list:
+        """Fetch the timings of every lap in a race with a single request
+
+        Arguments:
+            season {int or str} -- Season as integer or string
+            race {int} -- Race number within the season
+
+        Keyword Arguments:
+            filters {dict or tuple} -- Desired filters (default: {None})
+
+        Returns:
+            list -- DataFrame of timings for each lap, in lap order
+        """
+        data = QueryRaceLapTimes(season=season, race=race, **kwargs).call()
+        return split_by(data, "lap")
+
+
+class QueryRaceLapTimes(QueryBase):
+    """Query object for querying the timings of every lap in a race"""
+
+    __slots__ = ()
+
+    supports_season = True
+    requires_season = True
+    supports_race = True
+    requires_race = True
+
+    SUPPORTED_FILTERS = frozenset()
+    DTYPES = dict(QueryLapTimes.DTYPES, lap="int16")
+
+    def __init__(self, **kwargs) -> None:
+        super(QueryRaceLapTimes, self).__init__(**kwargs)
+
+    def get_data(self) -> str:
+        """Return data for the lap times of a full race.
+
+        Returns:
+            str -- string to add to url
+        """
+        return "/{}/{}/laps".format(self.season, self.race)
+
+    def format_data(self, json_data, keep_url=False) -> DataFrame:
+        return self.build_frame(
+            [
+                dict(timing, lap=lap["number"])
+                for race in json_data["MRData"]["RaceTable"]["Races"]
+                for lap in race["Laps"]
+                for timing in lap["Timings"]
+            ],
+            keep_url,
         )
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from formula1.ergast import CACHE_ENV, ErgastFilters, QueryBase
+
+ERGAST_FILTERS = frozenset(
+    value for name, value in vars(ErgastFilters).items() if not name.startswith("_")
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--network",
+        action="store_true",
+        default=False,
+        help="run tests that call the live Ergast API",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "network: test calls the live Ergast API")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--network") or os.environ.get("CI"):
+        return
+
+    skip_network = pytest.mark.skip(reason="needs --network")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip_network)
+
+
+@pytest.fixture(scope="session")
+def ergast_filters():
+    """Every filter value defined on ErgastFilters"""
+    return ERGAST_FILTERS
+
+
+@pytest.fixture(autouse=True)
+def ergast_cache(tmp_path, monkeypatch):
+    """Point the shared session at a response cache private to each test, so
+    tests never read or write the real per user cache"""
+    cache_path = tmp_path / "cache" / "ergast"
+    monkeypatch.setenv(CACHE_ENV, str(cache_path))
+    QueryBase.close()
+    yield cache_path
+    QueryBase.close()
@@ -1,6 +1,14 @@
+import asyncio
+import os
+from pathlib import Path
+
 import pytest
+import requests
+import responses
+from hypothesis import given, strategies as st
 
 from formula1.ergast import (
+    CACHE_ENV,
     ErgastFilters,
     QueryBase,
     QueryRaceResults,
@@ -8,254 +16,763 @@ from formula1.ergast import (
     QuerySeason,
     QueryQualifyingResults,
     QueryLapTimes,
+    QueryRaceLapTimes,
+    QuerySeasonResults,
+    get_cache_path,
+    split_by,
 )
 
+BASE_URL = "https://ergast.com/api/f1"
+DATA_PATH = Path(__file__).parent / "data"
+
+CIRCUITS, CONSTRUCTORS, DRIVERS, GRID, RESULTS, FASTEST, STATUS = (
+    ErgastFilters.CIRCUITS,
+    ErgastFilters.CONSTRUCTORS,
+    ErgastFilters.DRIVERS,
+    ErgastFilters.GRID,
+    ErgastFilters.RESULTS,
+    ErgastFilters.FASTEST,
+    ErgastFilters.STATUS,
+)
 
-class TestQueries(object):
-    @pytest.mark.parametrize(
-        "filter,supported",
-        [
-            (ErgastFilters.CIRCUITS, True),
-            (ErgastFilters.CONSTRUCTORS, True),
-            (ErgastFilters.DRIVERS, True),
-            (ErgastFilters.GRID, True),
-            (ErgastFilters.RESULTS, True),
-            (ErgastFilters.FASTEST, True),
-            (ErgastFilters.STATUS, True),
-            ("bad_filter", False),
-        ],
-    )
-    def test_ergast_query_default_filters(self, filter, supported):
-        if supported:
-            QueryBase(season=None, race=None, filters={filter: 1})
+SUPPORTED_FILTERS = (CIRCUITS, CONSTRUCTORS, DRIVERS, GRID, RESULTS, FASTEST, STATUS)
+
+F_RESULTS = {RESULTS: 1}
+F_RESULTS_DRIVERS = {RESULTS: 1, DRIVERS: 1}
+F_GRID = {GRID: 1}
+F_GRID_DRIVERS = {GRID: 1, DRIVERS: 1}
+
+SEASON_CASES = (
+    (True, False, None, True),
+    (True, True, "current", True),
+    (True, True, 1950, True),
+    (True, True, 2021, True),
+    # Season not allowed string
+    (False, False, "current", False),
+    # Season not allowed int
+    (False, False, 2000, False),
+    # Season required but not provided
+    (True, True, None, False),
+    # Season is bad values
+    (True, True, "junk", False),
+    (True, True, 1949, False),
+    (True, True, 2022, False),
+)
+
+RACE_CASES = (
+    (True, False, None, True),
+    (True, True, 1, True),
+    (True, True, 23, True),
+    # Race not allowed
+    (False, False, 1, False),
+    # Race required but not provided
+    (True, True, None, False),
+    # Race is bad values
+    (True, True, 0, False),
+    (True, True, 24, False),
+)
+
+
+def expected_url(filters, *data):
+    """Build the url Ergast expects, filter segments in order then data"""
+    parts = [f"{filter}/{value}" for filter, value in (filters or {}).items()]
+    return "/".join([BASE_URL, *parts, *data])
+
+
+def check_cases(field, cases):
+    """Construct a query for each (supports, requires, value, result) case,
+    expecting a ValueError when result is False, and report every failing case"""
+    failures = []
+    for case in cases:
+        supports, requires, value, result = case
+        TestQuery = QueryBase._with_flags(
+            **{f"supports_{field}": supports, f"requires_{field}": requires}
+        )
+        try:
+            TestQuery(**{field: value})
+        except ValueError as error:
+            if result:
+                failures.append(f"{case}: unexpected ValueError: {error}")
         else:
-            with pytest.raises(ValueError):
-                QueryBase(season=None, race=None, filters={filter: 1})
-
-    @pytest.mark.parametrize(
-        "supports,requires,season,result",
-        [
-            (True, False, None, True),
-            (True, True, "current", True),
-            (True, True, 1950, True),
-            (True, True, 2000, True),
-            (True, True, 2021, True),
-            # Season not allowed string
-            (False, False, "current", False),
-            # Season not allowed int
-            (False, False, 2000, False),
-            # Season required but not provided
-            (True, True, None, False),
-            # Season is bad values
-            (True, True, "junk", False),
-            (True, True, 1949, False),
-            (True, True, 2022, False),
-        ],
+            if not result:
+                failures.append(f"{case}: did not raise ValueError")
+
+    if failures:
+        pytest.fail("\n".join(failures))
+
+
+def test_ergast_query_supported_filters():
+    QueryBase(season=None, race=None, filters={f: 1 for f in SUPPORTED_FILTERS})
+
+
+@pytest.mark.parametrize(
+    "query_class",
+    [
+        QueryBase,
+        QuerySeason,
+        QueryRaceSchedule,
+        QueryRaceResults,
+        QuerySeasonResults,
+        QueryQualifyingResults,
+        QueryLapTimes,
+        QueryRaceLapTimes,
+    ],
+    ids=lambda query_class: query_class.__name__,
+)
+def test_ergast_query_supported_filters_are_frozensets(query_class, ergast_filters):
+    assert isinstance(query_class.SUPPORTED_FILTERS, frozenset)
+    assert query_class.SUPPORTED_FILTERS <= ergast_filters
+
+
+def test_ergast_query_unsupported_filter():
+    pytest.raises(
+        ValueError, QueryBase, season=None, race=None, filters={"bad_filter": 1}
     )
-    def test_ergast_season_values(self, supports, requires, season, result):
-        class TestQuery(QueryBase):
-            supports_race = False
-            supports_season = supports
-            requires_season = requires
-
-        if result:
-            TestQuery(season=season)
-        else:
-            with pytest.raises(ValueError):
-                TestQuery(season=season)
-
-    @pytest.mark.parametrize(
-        "supports,requires,race,result",
-        [
-            (True, False, None, True),
-            (True, True, 1, True),
-            (True, True, 10, True),
-            (True, True, 23, True),
-            # Race not allowed
-            (False, False, 1, False),
-            # Race required but not provided
-            (True, True, None, False),
-            # Race is bad values
-            (True, True, 0, False),
-            (True, True, 24, False),
-        ],
+
+
+def test_ergast_with_flags_unknown_flag():
+    pytest.raises(ValueError, QueryBase._with_flags, supports_seasons=True)
+
+
+def test_ergast_with_flags_name():
+    TestQuery = QueryBase._with_flags(supports_season=True, requires_season=False)
+    assert TestQuery.__name__ == (
+        "QueryBase(requires_season=False, supports_season=True)"
     )
-    def test_ergast_race_values(self, supports, requires, race, result):
-        class TestQuery(QueryBase):
-            supports_season = False
-            supports_race = supports
-            requires_race = requires
-
-        if result:
-            TestQuery(race=race)
-        else:
-            with pytest.raises(ValueError):
-                TestQuery(race=race)
-
-    @pytest.mark.parametrize(
-        "supports,requires,lap,result",
-        [
-            (True, False, None, True),
-            (True, True, 1, True),
-            (True, True, 10, True),
-            (True, True, 100, True),
-            # Lap not allowed
-            (False, False, 1, False),
-            # Lap required but not provided
-            (True, True, None, False),
-            # Lap is bad values
-            (True, True, -1, False),
-            (True, True, 101, False),
-        ],
+    assert TestQuery is QueryBase._with_flags(
+        requires_season=False, supports_season=True
     )
-    def test_ergast_lap_values(self, supports, requires, lap, result):
-        class TestQuery(QueryBase):
-            supports_season = False
-            supports_lap = supports
-            requires_lap = requires
-
-        if result:
-            TestQuery(lap=lap)
-        else:
-            with pytest.raises(ValueError):
-                TestQuery(lap=lap)
 
-    def test_ergast_season_call(self):
-        query = QuerySeason(season=None, race=None, filters=None)
+
+def test_ergast_season_values():
+    check_cases("season", SEASON_CASES)
+
+
+@given(season=st.integers(min_value=1950, max_value=2021))
+def test_ergast_season_valid_range(season):
+    TestQuery = QueryBase._with_flags(supports_season=True, requires_season=True)
+    assert TestQuery(season=season).season == season
+
+
+@given(season=st.one_of(st.integers(max_value=1949), st.integers(min_value=2022)))
+def test_ergast_season_invalid_range(season):
+    TestQuery = QueryBase._with_flags(supports_season=True, requires_season=True)
+    pytest.raises(ValueError, TestQuery, season=season)
+
+
+def test_ergast_race_values():
+    check_cases("race", RACE_CASES)
+
+
+@given(race=st.integers(min_value=1, max_value=23))
+def test_ergast_race_valid_range(race):
+    TestQuery = QueryBase._with_flags(supports_race=True, requires_race=True)
+    assert TestQuery(race=race).race == race
+
+
+@given(race=st.one_of(st.integers(max_value=0), st.integers(min_value=24)))
+def test_ergast_race_invalid_range(race):
+    TestQuery = QueryBase._with_flags(supports_race=True, requires_race=True)
+    pytest.raises(ValueError, TestQuery, race=race)
+
+
+@pytest.mark.parametrize(
+    "supports,requires,lap,result",
+    [
+        (True, False, None, True),
+        (True, True, 1, True),
+        (True, True, 10, True),
+        (True, True, 100, True),
+        # Lap not allowed
+        (False, False, 1, False),
+        # Lap required but not provided
+        (True, True, None, False),
+        # Lap is bad values
+        (True, True, -1, False),
+        (True, True, 101, False),
+    ],
+    ids=[
+        "optional-none",
+        "required-first",
+        "required-interior",
+        "required-last",
+        "unsupported",
+        "required-missing",
+        "below-range",
+        "above-range",
+    ],
+)
+def test_ergast_lap_values(supports, requires, lap, result):
+    TestQuery = QueryBase._with_flags(supports_lap=supports, requires_lap=requires)
+
+    if result:
+        TestQuery(lap=lap)
+    else:
+        pytest.raises(ValueError, TestQuery, lap=lap)
+
+
+def test_ergast_session_is_built_on_first_use():
+    QueryBase.close()
+    assert QueryBase._session is None
+
+    session = QuerySeason.get_session()
+
+    assert session is QueryBase.get_session()
+    assert QueryBase._session is session
+
+
+@responses.activate
+def test_ergast_cache_is_outside_working_directory(ergast_cache, tmp_path, monkeypatch):
+    working_directory = tmp_path / "work"
+    working_directory.mkdir()
+    monkeypatch.chdir(working_directory)
+    responses.add(
+        responses.GET,
+        "https://ergast.com/api/f1/seasons.json",
+        json=seasons_page(1950),
+    )
+
+    QuerySeason().call()
+
+    assert list(working_directory.iterdir()) == []
+    assert ergast_cache.with_suffix(".sqlite").exists()
+
+
+def test_ergast_cache_path_defaults_to_xdg_cache_home(tmp_path, monkeypatch):
+    monkeypatch.delenv(CACHE_ENV)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert get_cache_path() == os.path.join(str(tmp_path), "formula1-ds", "ergast")
+
+
+def test_ergast_query_validators_follow_support_flags():
+    assert QueryBase.check_season not in QuerySeason.VALIDATORS
+    assert QueryBase.check_season_not_supported in QuerySeason.VALIDATORS
+    assert QueryBase.check_race_required in QueryRaceResults.VALIDATORS
+    assert QueryBase.check_race_required not in QueryRaceSchedule.VALIDATORS
+    assert QueryBase.check_race in QueryRaceSchedule.VALIDATORS
+
+
+@responses.activate
+def test_ergast_season_call():
+    responses.add(
+        responses.GET,
+        "https://ergast.com/api/f1/seasons.json",
+        body=(DATA_PATH / "seasons.json").read_bytes(),
+        status=200,
+    )
+    query = QuerySeason(season=None, race=None, filters=None)
+    with QueryBase.get_session().cache_disabled():
         data = query.call()
-        assert data is not None
 
-    def test_ergast_season_query(self):
-        query = QuerySeason(season=None, race=None, filters=None)
-        query_url = query.get_url()
+    assert data is not None
+    assert list(data.columns) == ["season"]
+    assert list(data["season"]) == list(range(1950, 2022))
 
-        assert query_url == "https://ergast.com/api/f1/seasons"
 
-        query = QuerySeason(season=None, race=None, filters={ErgastFilters.RESULTS: 1})
-        query_url = query.get_url()
+@pytest.mark.network
+def test_ergast_season_call_live():
+    query = QuerySeason(season=None, race=None, filters=None)
+    with QueryBase.get_session().cache_disabled():
+        data = query.call()
 
-        assert query_url == "https://ergast.com/api/f1/results/1/seasons"
+    assert data is not None
 
-        query = QuerySeason(
-            season=None,
-            race=None,
-            filters={ErgastFilters.RESULTS: 1, ErgastFilters.DRIVERS: 1},
-        )
-        query_url = query.get_url()
 
-        assert query_url == "https://ergast.com/api/f1/results/1/drivers/1/seasons"
+@pytest.mark.parametrize(
+    "filters",
+    [None, F_RESULTS, F_RESULTS_DRIVERS, {CIRCUITS: "monza", DRIVERS: "leclerc"}],
+    ids=["no-filters", "results", "results-drivers", "circuits-drivers"],
+)
+def test_ergast_season_query(filters):
+    query = QuerySeason(season=None, race=None, filters=filters)
 
-    def test_ergast_season_query_takes_no_season_or_race(self):
-        with pytest.raises(ValueError):
-            QuerySeason(season="something", race=None, filters=None)
+    assert query.get_url() == expected_url(filters, "seasons")
 
-        with pytest.raises(ValueError):
-            QuerySeason(season=None, race="something", filters=None)
 
-        with pytest.raises(ValueError):
-            QuerySeason(season="something", race="something", filters=None)
+def test_ergast_season_query_accepts_filter_pairs():
+    query = QuerySeason(filters=((RESULTS, 1), (DRIVERS, 1)))
 
-    def test_ergast_race_schedule_query(self):
-        query = QueryRaceSchedule(season="current", race=None, filters=None)
-        query_url = query.get_url()
+    assert query.get_url() == "https://ergast.com/api/f1/results/1/drivers/1/seasons"
 
-        assert query_url == "https://ergast.com/api/f1/current"
+    pytest.raises(ValueError, QuerySeason, filters=(("bad_filter", 1),))
 
-        query = QueryRaceSchedule(season="current", race=2, filters=None)
-        query_url = query.get_url()
 
-        assert query_url == "https://ergast.com/api/f1/current/2"
+def test_ergast_season_query_takes_no_season_or_race():
+    pytest.raises(ValueError, QuerySeason, season="something", race=None, filters=None)
 
-        query = QueryRaceSchedule(
-            season="current", race=2, filters={ErgastFilters.RESULTS: 1}
-        )
-        query_url = query.get_url()
+    pytest.raises(ValueError, QuerySeason, season=None, race="something", filters=None)
 
-        assert query_url == "https://ergast.com/api/f1/results/1/current/2"
+    pytest.raises(
+        ValueError, QuerySeason, season="something", race="something", filters=None
+    )
 
-        query = QueryRaceSchedule(
-            season="current",
-            race=2,
-            filters={ErgastFilters.RESULTS: 1, ErgastFilters.DRIVERS: 1},
-        )
-        query_url = query.get_url()
 
-        assert query_url == "https://ergast.com/api/f1/results/1/drivers/1/current/2"
+def test_ergast_race_schedule_query():
+    cases = [
+        (None, None, "https://ergast.com/api/f1/current"),
+        (2, None, "https://ergast.com/api/f1/current/2"),
+        (2, F_RESULTS, "https://ergast.com/api/f1/results/1/current/2"),
+        (
+            2,
+            F_RESULTS_DRIVERS,
+            "https://ergast.com/api/f1/results/1/drivers/1/current/2",
+        ),
+    ]
+    urls = [
+        QueryRaceSchedule(season="current", race=race, filters=filters).get_url()
+        for race, filters, _ in cases
+    ]
 
-    def test_ergast_race_schedule_query_requires_season(self):
-        with pytest.raises(ValueError):
-            QueryRaceSchedule(season=None, race=None, filters=None)
+    assert urls == [expected for _, _, expected in cases]
 
-    def test_ergast_race_results_query(self):
-        query = QueryRaceResults(season="current", race=2, filters=None)
-        query_url = query.get_url()
 
-        assert query_url == "https://ergast.com/api/f1/current/2/results"
+def test_ergast_race_schedule_query_coerces_integers():
+    query = QueryRaceSchedule(season=2000.0, race="2", filters=None)
 
-        query = QueryRaceResults(
-            season="current", race=2, filters={ErgastFilters.GRID: 1}
-        )
-        query_url = query.get_url()
+    assert query.season == 2000
+    assert query.race == 2
 
-        assert query_url == "https://ergast.com/api/f1/grid/1/current/2/results"
+    pytest.raises(ValueError, QueryRaceSchedule, season=2000, race="junk", filters=None)
 
-        query = QueryRaceResults(
-            season="current",
-            race=2,
-            filters={ErgastFilters.GRID: 1, ErgastFilters.DRIVERS: 1},
-        )
-        query_url = query.get_url()
 
-        assert (
-            query_url == "https://ergast.com/api/f1/grid/1/drivers/1/current/2/results"
-        )
+@pytest.mark.parametrize(
+    "field,value",
+    [("season", [2000]), ("race", [1]), ("lap", {1: 1}), ("race", "junk")],
+    ids=["season-list", "race-list", "lap-dict", "race-string"],
+)
+def test_ergast_query_rejects_non_integer_values(field, value):
+    TestQuery = QueryBase._with_flags(
+        **{f"supports_{field}": True, f"requires_{field}": True}
+    )
 
-    def test_ergast_race_results_query_requires_season_and_race(self):
-        with pytest.raises(ValueError):
-            QueryRaceResults(season=None, race=None, filters=None)
+    with pytest.raises(ValueError) as error:
+        TestQuery(**{field: value})
 
-        with pytest.raises(ValueError):
-            QueryRaceResults(season="current", race=None, filters=None)
+    assert error.value.__cause__ is None
+    assert error.value.__suppress_context__
 
-    def test_ergast_race_results_query_does_not_support_results(self):
-        with pytest.raises(ValueError):
-            QueryRaceResults(
-                season="current", race=1, filters={ErgastFilters.RESULTS: 1}
-            )
 
-    def test_ergast_qualifying_results_query(self):
-        query = QueryQualifyingResults(season="current", race=2, filters=None)
-        query_url = query.get_url()
+def test_ergast_race_schedule_query_requires_season():
+    pytest.raises(ValueError, QueryRaceSchedule, season=None, race=None, filters=None)
 
-        assert query_url == "https://ergast.com/api/f1/current/2/qualifying"
 
-        query = QueryQualifyingResults(
-            season="current", race=2, filters={ErgastFilters.GRID: 1}
-        )
-        query_url = query.get_url()
+def test_ergast_race_results_query():
+    cases = [
+        (None, "https://ergast.com/api/f1/current/2/results"),
+        (F_GRID, "https://ergast.com/api/f1/grid/1/current/2/results"),
+        (
+            F_GRID_DRIVERS,
+            "https://ergast.com/api/f1/grid/1/drivers/1/current/2/results",
+        ),
+    ]
+    urls = [
+        QueryRaceResults(season="current", race=2, filters=filters).get_url()
+        for filters, _ in cases
+    ]
+
+    assert urls == [expected for _, expected in cases]
+
+
+def test_ergast_race_results_query_requires_season_and_race():
+    pytest.raises(ValueError, QueryRaceResults, season=None, race=None, filters=None)
+
+    pytest.raises(
+        ValueError, QueryRaceResults, season="current", race=None, filters=None
+    )
+
+
+def test_ergast_race_results_query_does_not_support_results():
+    pytest.raises(
+        ValueError,
+        QueryRaceResults,
+        season="current",
+        race=1,
+        filters=F_RESULTS,
+    )
+
+
+def test_ergast_qualifying_results_query():
+    cases = [
+        (None, "https://ergast.com/api/f1/current/2/qualifying"),
+        (F_GRID, "https://ergast.com/api/f1/grid/1/current/2/qualifying"),
+        (
+            F_GRID_DRIVERS,
+            "https://ergast.com/api/f1/grid/1/drivers/1/current/2/qualifying",
+        ),
+    ]
+    urls = [
+        QueryQualifyingResults(season="current", race=2, filters=filters).get_url()
+        for filters, _ in cases
+    ]
+
+    assert urls == [expected for _, expected in cases]
+
+
+def test_ergast_lap_times_query():
+    query = QueryLapTimes(season="current", race=2, lap=1, filters=None)
+    query_url = query.get_url()
+
+    assert query_url == "https://ergast.com/api/f1/current/2/laps/1"
+
+    # Lap times doesn't support any filters
+    pytest.raises(
+        ValueError,
+        QueryLapTimes,
+        season="current",
+        race=2,
+        lap=1,
+        filters=F_GRID,
+    )
+
+
+def test_ergast_season_results_query():
+    query = QuerySeasonResults(season=2020, filters=None)
+
+    assert query.get_url() == "https://ergast.com/api/f1/2020/results"
+    assert query.get_params() == {"limit": 1000}
+
+    pytest.raises(ValueError, QuerySeasonResults, season=2020, race=1, filters=None)
+
+
+def test_ergast_season_results_split_by_round():
+    json_data = {
+        "MRData": {
+            "RaceTable": {
+                "Races": [
+                    {"round": "1", "Results": [{"number": "44"}, {"number": "77"}]},
+                    {"round": "2", "Results": [{"number": "33"}]},
+                ]
+            }
+        }
+    }
+    data = QuerySeasonResults(season=2020).format_data(json_data)
+    races = split_by(data, "round")
+
+    assert len(races) == 2
+    assert list(races[0]["number"]) == ["44", "77"]
+    assert list(races[1]["number"]) == ["33"]
+    assert "round" not in races[0].columns
+
+
+@responses.activate
+def test_ergast_race_results_bulk_for_season():
+    races = [
+        {"round": "1", "Results": [{"position": "1", "number": "77"}]},
+        {
+            "round": "2",
+            "Results": [
+                {"position": "1", "number": "44"},
+                {"position": "2", "number": "33"},
+            ],
+        },
+    ]
+    responses.add(
+        responses.GET,
+        "https://ergast.com/api/f1/drivers/hamilton/2020/results.json",
+        json={"MRData": {"total": "3", "RaceTable": {"Races": races}}},
+    )
+
+    results = QueryRaceResults.bulk_for_season(2020, filters={DRIVERS: "hamilton"})
+
+    assert [list(race["number"]) for race in results] == [["77"], ["44", "33"]]
+    assert "round" not in results[0].columns
+    assert len(responses.calls) == 1
+
+
+def test_ergast_season_results_pages_keep_dtypes():
+    pages = [
+        {
+            "MRData": {
+                "RaceTable": {
+                    "Races": [
+                        {
+                            "round": str(round),
+                            "Results": [
+                                {"position": "1", "Driver": {"driverId": driver}}
+                            ],
+                        }
+                    ]
+                }
+            }
+        }
+        for round, driver in ((1, "hamilton"), (2, "verstappen"))
+    ]
+    data = QuerySeasonResults(season=2020).process_data(pages)
+
+    assert list(data["Driver_driverId"]) == ["hamilton", "verstappen"]
+    assert data["Driver_driverId"].dtype == "category"
+    assert data["position"].dtype == "int16"
+    assert data["round"].dtype == "int8"
+
+
+def test_ergast_race_results_format_data():
+    json_data = {
+        "MRData": {
+            "RaceTable": {
+                "Races": [
+                    {
+                        "Results": [
+                            {
+                                "position": "1",
+                                "points": "25",
+                                "grid": "2",
+                                "Driver": {"driverId": "hamilton"},
+                            }
+                        ]
+                    }
+                ]
+            }
+        }
+    }
+    data = QueryRaceResults(season=2020, race=1).format_data(json_data)
+
+    assert data["position"].dtype == "int16"
+    assert data["points"].dtype == "float32"
+    assert data["grid"].dtype == "int8"
+    assert data["Driver_driverId"].dtype == "category"
+
+
+def test_ergast_format_data_drops_nested_urls():
+    race = {
+        "season": "2020",
+        "round": "1",
+        "url": "https://en.wikipedia.org/wiki/2020_Austrian_Grand_Prix",
+        "Circuit": {
+            "circuitId": "red_bull_ring",
+            "url": "https://en.wikipedia.org/wiki/Red_Bull_Ring",
+            "Location": {"locality": "Spielberg"},
+        },
+        "Results": [
+            {
+                "position": "1",
+                "Driver": {
+                    "driverId": "bottas",
+                    "url": "https://en.wikipedia.org/wiki/Valtteri_Bottas",
+                },
+                "Constructor": {
+                    "constructorId": "mercedes",
+                    "url": "https://en.wikipedia.org/wiki/Mercedes-Benz_in_Formula_One",
+                },
+            }
+        ],
+    }
+    json_data = {"MRData": {"RaceTable": {"Races": [race]}}}
 
-        assert query_url == "https://ergast.com/api/f1/grid/1/current/2/qualifying"
+    schedule = QueryRaceSchedule(season=2020).format_data(json_data)
+    results = QueryRaceResults(season=2020, race=1).format_data(json_data)
 
-        query = QueryQualifyingResults(
-            season="current",
-            race=2,
-            filters={ErgastFilters.GRID: 1, ErgastFilters.DRIVERS: 1},
+    assert not [c for c in schedule.columns if c.endswith("url")]
+    assert not [c for c in results.columns if c.endswith("url")]
+    assert "Circuit_Location_locality" in schedule.columns
+    assert "Driver_driverId" in results.columns
+
+    kept = QueryRaceResults(season=2020, race=1).format_data(json_data, keep_url=True)
+    assert {"Driver_url", "Constructor_url"} <= set(kept.columns)
+
+
+def test_ergast_race_lap_times_query():
+    query = QueryRaceLapTimes(season="current", race=2, filters=None)
+
+    assert query.get_url() == "https://ergast.com/api/f1/current/2/laps"
+    assert query.get_params() == {"limit": 1000}
+
+
+def lap_times_page(laps, drivers, offset, limit=1000):
+    """Ergast lap times response holding one page of the race's timings"""
+    timings = [
+        {"lap": str(lap), "driverId": f"driver{driver}", "position": str(driver)}
+        for lap in range(1, laps + 1)
+        for driver in range(1, drivers + 1)
+    ]
+    page = timings[offset : offset + limit]
+    laps_json = {}
+    for timing in page:
+        laps_json.setdefault(timing["lap"], []).append(
+            {"driverId": timing["driverId"], "position": timing["position"]}
         )
-        query_url = query.get_url()
+    return {
+        "MRData": {
+            "limit": str(limit),
+            "offset": str(offset),
+            "total": str(len(timings)),
+            "RaceTable": {
+                "Races": [
+                    {
+                        "Laps": [
+                            {"number": lap, "Timings": lap_timings}
+                            for lap, lap_timings in laps_json.items()
+                        ]
+                    }
+                ]
+            },
+        }
+    }
+
+
+@responses.activate
+def test_ergast_race_lap_times_call_spans_pages():
+    url = "https://ergast.com/api/f1/2020/1/laps.json"
+    responses.add(responses.GET, url, json=lap_times_page(75, 20, 0))
+    responses.add(responses.GET, url, json=lap_times_page(75, 20, 1000))
+
+    query = QueryRaceLapTimes(season=2020, race=1)
+    with QueryBase.get_session().cache_disabled():
+        data = query.call()
+
+    assert len(data) == 1500
+    assert len(responses.calls) == 2
+    assert "offset=1000" in responses.calls[1].request.url
+    assert list(data["lap"].drop_duplicates()) == list(range(1, 76))
+
+
+@responses.activate
+def test_ergast_lap_times_bulk_for_race():
+    responses.add(
+        responses.GET,
+        "https://ergast.com/api/f1/2020/1/laps.json",
+        json=lap_times_page(3, 2, 0),
+    )
+
+    laps = QueryLapTimes.bulk_for_race(2020, 1)
+
+    assert len(laps) == 3
+    assert [list(lap["driverId"]) for lap in laps] == [["driver1", "driver2"]] * 3
+    assert "lap" not in laps[0].columns
+    assert len(responses.calls) == 1
+
+    pytest.raises(ValueError, QueryLapTimes.bulk_for_race, 2020, 1, filters=F_GRID)
+
+
+def page_info(limit, offset, total):
+    """MRData paging fields as Ergast returns them"""
+    return {"MRData": {"limit": limit, "offset": offset, "total": total}}
+
 
-        assert (
-            query_url
-            == "https://ergast.com/api/f1/grid/1/drivers/1/current/2/qualifying"
+def test_ergast_query_page_offsets():
+    query = QuerySeason(season=None, race=None, filters=None)
+
+    assert query.get_params() == {"limit": 1000}
+    assert query.get_params(2000) == {"limit": 1000, "offset": 2000}
+    assert list(query.get_page_offsets(page_info("1000", "0", "72"))) == []
+    assert list(query.get_page_offsets(page_info("1000", "0", "2500"))) == [
+        1000,
+        2000,
+    ]
+
+
+def test_ergast_query_page_offsets_follow_server_limit():
+    query = QuerySeason(season=None, race=None, filters=None)
+
+    # Server capped the page at 30 rows despite the requested limit
+    assert list(query.get_page_offsets(page_info("30", "0", "100"))) == [30, 60, 90]
+    assert list(query.get_page_offsets(page_info("30", "30", "100"))) == [60, 90]
+
+
+def test_ergast_query_concatenates_pages():
+    pages = [
+        {"MRData": {"SeasonTable": {"Seasons": [{"season": "1950", "url": ""}]}}},
+        {"MRData": {"SeasonTable": {"Seasons": [{"season": "1951", "url": ""}]}}},
+    ]
+    data = QuerySeason().process_data(pages)
+
+    assert list(data["season"]) == [1950, 1951]
+    assert "url" not in data.columns
+
+
+def seasons_page(*seasons, limit=1000, offset=0, total=None):
+    """Ergast seasons response holding the given seasons"""
+    return {
+        "MRData": {
+            "limit": str(limit),
+            "offset": str(offset),
+            "total": str(len(seasons) if total is None else total),
+            "SeasonTable": {"Seasons": [{"season": str(s)} for s in seasons]},
+        }
+    }
+
+
+@responses.activate
+def test_ergast_bulk_call_returns_results_in_query_order():
+    responses.add(
+        responses.GET,
+        "https://ergast.com/api/f1/seasons.json",
+        json=seasons_page(1950, 1951),
+    )
+    responses.add(
+        responses.GET,
+        "https://ergast.com/api/f1/drivers/1/seasons.json",
+        json=seasons_page(2000),
+    )
+
+    with QueryBase.get_session().cache_disabled():
+        seasons, driver_seasons = QueryBase.bulk_call(
+            [QuerySeason(), QuerySeason(filters={DRIVERS: 1})]
         )
 
-    def test_ergast_lap_times_query(self):
-        query = QueryLapTimes(season="current", race=2, lap=1, filters=None)
-        query_url = query.get_url()
+    assert list(seasons["season"]) == [1950, 1951]
+    assert list(driver_seasons["season"]) == [2000]
+
+
+@responses.activate
+def test_ergast_bulk_call_uses_shared_session():
+    responses.add(
+        responses.GET,
+        "https://ergast.com/api/f1/seasons.json",
+        json=seasons_page(1950),
+    )
+
+    with QueryBase.get_session().cache_disabled():
+        QueryBase.bulk_call([QuerySeason()])
+
+    headers = responses.calls[0].request.headers
+    assert headers["User-Agent"] == "formula1-ds"
+    assert "gzip" in headers["Accept-Encoding"]
+
+
+@responses.activate
+def test_ergast_bulk_call_fetches_remaining_pages():
+    url = "https://ergast.com/api/f1/seasons.json"
+    responses.add(responses.GET, url, json=seasons_page(1950, limit=1, total=2))
+    responses.add(
+        responses.GET, url, json=seasons_page(1951, limit=1, offset=1, total=2)
+    )
+
+    with QueryBase.get_session().cache_disabled():
+        (seasons,) = QueryBase.bulk_call([QuerySeason()])
+
+    assert list(seasons["season"]) == [1950, 1951]
+    assert "offset=1" in responses.calls[1].request.url
+
+
+@responses.activate
+def test_ergast_bulk_call_raises_for_status():
+    responses.add(responses.GET, "https://ergast.com/api/f1/seasons.json", status=404)
+
+    with QueryBase.get_session().cache_disabled():
+        pytest.raises(requests.HTTPError, QueryBase.bulk_call, [QuerySeason()])
+
+
+def test_ergast_bulk_call_without_queries():
+    assert QueryBase.bulk_call([]) == []
+
+
+@responses.activate
+def test_ergast_bulk_call_inside_running_loop():
+    responses.add(
+        responses.GET,
+        "https://ergast.com/api/f1/seasons.json",
+        json=seasons_page(1950),
+    )
+
+    async def notebook_cell():
+        return QueryBase.bulk_call([QuerySeason()])
 
-        assert query_url == "https://ergast.com/api/f1/current/2/laps/1"
+    loop = asyncio.new_event_loop()
+    try:
+        with QueryBase.get_session().cache_disabled():
+            (seasons,) = loop.run_until_complete(notebook_cell())
+    finally:
+        loop.close()
 
-        # Lap times doesn't support any filters
-        with pytest.raises(ValueError):
-            QueryLapTimes(
-                season="current", race=2, lap=1, filters={ErgastFilters.GRID: 1}
-            )
+    assert list(seasons["season"]) == [1950]